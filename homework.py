@@ -1,12 +1,21 @@
 import logging
 import os
+import random
 import sys
 import time
+import types
+from collections import OrderedDict
+from http import HTTPStatus
 
 import requests
 import telegram
 from dotenv import load_dotenv
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -22,13 +31,29 @@ TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 RETRY_PERIOD = 600
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
-
-HOMEWORK_VERDICTS = {
-    'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
-    'reviewing': 'Работа взята на проверку ревьюером.',
-    'rejected': 'Работа проверена: у ревьюера есть замечания.'
+REQUEST_TIMEOUT = (5, 30)
+IDLE_BACKOFF_AFTER = 3
+MAX_IDLE_PERIOD = 3600
+SENT_CACHE_LIMIT = 1024
+SEND_RETRIES = 3
+
+HOMEWORK_VERDICTS = types.MappingProxyType({
+    sys.intern('approved'):
+        'Работа проверена: ревьюеру всё понравилось. Ура!',
+    sys.intern('reviewing'): 'Работа взята на проверку ревьюером.',
+    sys.intern('rejected'): 'Работа проверена: у ревьюера есть замечания.'
+})
+
+_VERDICT_TEMPLATES = {
+    status: f'Изменился статус проверки работы "{{}}". {verdict}'
+    for status, verdict in HOMEWORK_VERDICTS.items()
 }
 
+_last_etag = None
+_last_modified = None
+_last_payload = None
+_request_headers = dict(HEADERS)
+
 
 def check_tokens():
     """Проверка доступности переменных окружения."""
@@ -37,11 +62,8 @@ def check_tokens():
         'TELEGRAM_TOKEN': TELEGRAM_TOKEN,
         'TELEGRAM_CHAT_ID': TELEGRAM_CHAT_ID
     }
-    missing_tokens = []
-
-    for token_name, token_value in required_tokens.items():
-        if not token_value:
-            missing_tokens.append(token_name)
+    missing_tokens = [name for name, value in required_tokens.items()
+                      if not value]
 
     if missing_tokens:
         error_message = (f"Отсутствуют переменные окружения: "
@@ -56,29 +78,55 @@ def send_message(bot, message):
         bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
         logger.debug('Сообщение успешно отправлено в телеграм чат.')
     except Exception as error:
-        logger.error(f'Ошибка при отправке сообщения в телеграм чат: {error}')
+        logger.error('Ошибка при отправке сообщения в телеграм чат: %s',
+                     error)
+        return False
+
+    return True
 
 
 def get_api_answer(timestamp):
     """Запрос к API-сервису."""
+    global _last_etag, _last_modified, _last_payload, _request_headers
+
     params = {
         'from_date': timestamp,
     }
 
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=params)
+        response = requests.get(ENDPOINT, headers=_request_headers,
+                                params=params, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
     except requests.exceptions.RequestException as error:
-        logger.error(f'Ошибка запроса API: {error}')
-        return response.json()
-    except requests.exceptions.HTTPError as error:
-        logger.error(f'Ошибка запроса API: {error.response.status_code}')
-        return response.json()
+        logger.error('Ошибка запроса API: %s', error)
+        raise ConnectionError(f'Ошибка запроса API: {error}') from error
+
+    if response.status_code == HTTPStatus.NOT_MODIFIED and _last_payload:
+        return _last_payload
 
-    if response.status_code != 200:
-        raise AssertionError('Произошла ошибка при запросе API')
+    if response.status_code != HTTPStatus.OK:
+        raise ConnectionError(
+            f'Произошла ошибка при запросе API: {response.status_code}')
 
-    return response.json()
+    response_headers = getattr(response, 'headers', None) or {}
+    new_etag = response_headers.get('ETag')
+    new_modified = response_headers.get('Last-Modified')
+    if (new_etag, new_modified) != (_last_etag, _last_modified):
+        _last_etag = new_etag
+        _last_modified = new_modified
+        _request_headers = dict(HEADERS)
+        if _last_etag:
+            _request_headers['If-None-Match'] = _last_etag
+        if _last_modified:
+            _request_headers['If-Modified-Since'] = _last_modified
+
+    content = getattr(response, 'content', None)
+    if content is None:
+        _last_payload = response.json()
+    else:
+        _last_payload = json_loads(content)
+
+    return _last_payload
 
 
 def check_response(response):
@@ -101,26 +149,64 @@ def check_response(response):
 
 def parse_status(homework):
     """Извлечение статуса домашней работы."""
-    required_keys = ['homework_name', 'status']
-
-    for key in required_keys:
-        if key not in homework:
-            error_message = f'Отсутствует ключ "{key}" в ответе API'
-            logger.debug(error_message)
-            raise ValueError(error_message)
-
-    homework_name = homework['homework_name']
-    homework_status = homework['status']
+    try:
+        homework_name = homework['homework_name']
+        homework_status = homework['status']
+    except KeyError as error:
+        error_message = f'Отсутствует ключ {error} в ответе API'
+        logger.debug(error_message)
+        raise ValueError(error_message)
 
-    if homework_status not in HOMEWORK_VERDICTS:
+    try:
+        template = _VERDICT_TEMPLATES[homework_status]
+    except KeyError:
         error_message = (f'Неизвестный статус работы '
                          f'"{homework_name}": {homework_status}')
         logger.debug(error_message)
         raise ValueError(error_message)
 
-    verdict = HOMEWORK_VERDICTS[homework_status]
+    return template.format(homework_name)
+
+
+def _collect_messages(homeworks, sent_cache, pending):
+    """Постановка новых сообщений о статусах в очередь отправки."""
+    for homework in homeworks:
+        try:
+            message = parse_status(homework)
+        except ValueError as error:
+            logger.error('Сбой при обработке домашней работы: %s', error)
+            continue
+        if message not in sent_cache and message not in pending:
+            pending.append(message)
+
 
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+def _deliver_message(bot, message, sent_cache):
+    """Отправка сообщения с ограниченным числом попыток."""
+    for _ in range(SEND_RETRIES):
+        if send_message(bot, message):
+            sent_cache[message] = None
+            if len(sent_cache) > SENT_CACHE_LIMIT:
+                sent_cache.popitem(last=False)
+            return True
+
+    return False
+
+
+def _next_wakeup(next_tick, fail_count, idle_count):
+    """Расчёт момента и длительности паузы до следующего опроса API."""
+    if fail_count:
+        period = min(RETRY_PERIOD, 2 ** fail_count * 2 + random.uniform(0, 1))
+    else:
+        idle_extra = max(0, idle_count - IDLE_BACKOFF_AFTER)
+        period = min(MAX_IDLE_PERIOD, RETRY_PERIOD * 2 ** idle_extra)
+
+    next_tick += period
+    delay = round(next_tick - time.monotonic())
+    if delay <= 0:
+        next_tick = time.monotonic() + period
+        delay = period
+
+    return next_tick, delay
 
 
 def main():
@@ -128,6 +214,11 @@ def main():
     check_tokens()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
+    fail_count = 0
+    idle_count = 0
+    sent_cache = OrderedDict()
+    pending = []
+    next_tick = time.monotonic()
 
     while True:
         try:
@@ -136,16 +227,26 @@ def main():
 
             homeworks = response['homeworks']
             if homeworks:
-                for homework in homeworks:
-                    message = parse_status(homework)
-                    send_message(bot, message)
-
-            timestamp = response['current_date']
+                idle_count = 0
+                _collect_messages(homeworks, sent_cache, pending)
+            else:
+                idle_count += 1
+
+            undelivered = []
+            for message in pending:
+                if not _deliver_message(bot, message, sent_cache):
+                    undelivered.append(message)
+            pending = undelivered[-SENT_CACHE_LIMIT:]
+
+            timestamp = response.get('current_date', timestamp)
+            fail_count = 0
         except Exception as error:
-            message = f'Сбой в работе программы: {error}'
-            logger.error(message)
+            logger.error('Сбой в работе программы: %s', error)
+            fail_count += 1
         finally:
-            time.sleep(RETRY_PERIOD)
+            next_tick, delay = _next_wakeup(
+                next_tick, fail_count, idle_count)
+            time.sleep(delay)
 
 
 if __name__ == '__main__':